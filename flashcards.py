@@ -1,72 +1,293 @@
+import hashlib
 import json
+import os
+import pickle
 import random
+import sys
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Any
+from sys import intern
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
 
-def load_cards_from_json(path: str = "Questions/flashcards.json") -> List[Dict[str, Any]]:
-    """Load parsed multiple-choice questions from JSON."""
-    file_path = Path(path)
-    if not file_path.exists():
-        raise FileNotFoundError(f"Could not find {file_path.resolve()}")
+# Bump whenever Card/Choice or the cache layout change so stale pickle
+# caches are ignored
+CARD_CACHE_VERSION = 4
 
-    with file_path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
 
-    if not isinstance(data, list):
-        raise ValueError("flashcards.json must contain a list of questions")
+@dataclass(slots=True, frozen=True)
+class Choice:
+    """One answer option of a card."""
+    letter: str
+    text: str
+
 
+@dataclass(slots=True, frozen=True)
+class Card:
+    """A normalized multiple-choice question, ready for the quiz loop."""
+    id: Optional[str]
+    source_file: Optional[str]
+    question: str
+    choices: Tuple[Choice, ...]
+    correct_letter: Optional[str]
+    correct_index: Optional[int]
+    correct_text: Optional[str]
+    valid_mask: int  # bit (ord(letter) - ord("a")) set for each choice letter
+    rendered: str  # question and choices, formatted for display
+
+
+def load_cards_from_json(path: str = "Questions/flashcards.json") -> List[Card]:
+    """Load parsed multiple-choice questions from JSON."""
+    file_path = Path(path)
+
+    # Warm start: reuse the cards pickled from this JSON if it hasn't changed.
+    # The key is taken before the JSON is read, so a file replaced while it
+    # is being loaded can only make the next run miss the cache.
+    cache_path = _cache_path(file_path)
+    json_key = _json_cache_key(file_path)
+    cached = _load_cached_cards(cache_path, json_key)
+    if cached is not None:
+        cards, skipped = cached
+        for message in skipped:
+            print(message)
+        print(f"Loaded {len(cards)} cards from {file_path.name} (cached)")
+        return cards
+
+    # Skip messages are collected so a warm start can repeat them
     cards = []
-    for idx, raw in enumerate(data, start=1):
-        question = raw.get("question", "").strip()
-        choices = raw.get("choices") or []
-        correct_letter = (raw.get("correct_letter") or "").lower() or None
-
-        if not question or not choices:
-            print(f"Skipping malformed card #{idx} (missing question or choices)")
-            continue
-
-        # Normalize choices (letters + text)
-        norm_choices = []
-        for ch in choices:
-            letter = (ch.get("letter") or "").lower()
-            text = (ch.get("text") or "").strip()
-            if not letter or not text:
-                continue
-            norm_choices.append({"letter": letter, "text": text})
-
-        if not norm_choices:
-            print(f"Skipping card #{idx} (no valid choices)")
-            continue
-
-        # Map correct letter to index if possible
-        letter_to_index = {c["letter"]: i for i, c in enumerate(norm_choices)}
-        correct_index = letter_to_index.get(correct_letter) if correct_letter else None
-
-        card = {
-            "id": raw.get("id"),
-            "source_file": raw.get("source_file"),
-            "question": question,
-            "choices": norm_choices,
-            "correct_letter": correct_letter,
-            "correct_index": correct_index,
-        }
-        cards.append(card)
+    skipped: List[str] = []
+    for idx, raw in enumerate(_read_card_entries(file_path), start=1):
+        card = _normalize_card(idx, raw, skipped)
+        if card is not None:
+            cards.append(card)
+    for message in skipped:
+        print(message)
 
     if not cards:
         raise ValueError("No valid cards loaded from JSON.")
 
+    rows = [_card_row(card) for card in cards]
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(pickle.dumps((CARD_CACHE_VERSION, json_key, rows, skipped), protocol=5))
+    except OSError:
+        pass  # caching is best-effort (e.g. read-only directory)
+
     print(f"Loaded {len(cards)} cards from {file_path.name}")
     return cards
 
 
-def run_flashcards(cards: List[Dict[str, Any]]) -> None:
-    """Main flashcard / quiz loop."""
+def stream_cards(path: str = "Questions/flashcards.json", shuffle: bool = True) -> Tuple[int, Iterator[Card]]:
+    """
+    Return (total, cards) where each Card is only built when it is reached.
 
-    # Randomize order of cards once per session
-    random.shuffle(cards)
+    The JSON is read once; total is exactly the number of cards the iterator
+    yields. A valid pickle cache written by load_cards_from_json is used
+    instead of the JSON when there is one. With shuffle=True only a list of
+    entry indices is shuffled.
+    """
+    file_path = Path(path)
+    cached = _load_cached_cards(_cache_path(file_path), _json_cache_key(file_path))
+    if cached is not None:
+        cards, skipped = cached
+        for message in skipped:
+            print(message)
+        if shuffle:
+            random.shuffle(cards)
+        return len(cards), iter(cards)
+
+    data = _read_card_entries(file_path)
+    order = []
+    for idx, raw in enumerate(data, start=1):
+        message = _skip_message(idx, raw)
+        if message:
+            print(message)
+        else:
+            order.append(idx - 1)
+    if shuffle:
+        random.shuffle(order)
+    return len(order), (_normalize_card(i + 1, data[i]) for i in order)
+
+
+def _read_card_entries(file_path: Path) -> List[Dict[str, Any]]:
+    """Read the raw question entries from a flashcards JSON file."""
+    if not file_path.exists():
+        raise FileNotFoundError(f"Could not find {file_path.resolve()}")
+
+    raw_bytes = file_path.read_bytes()
+    data = orjson.loads(raw_bytes) if orjson is not None else json.loads(raw_bytes)
+
+    if not isinstance(data, list):
+        raise ValueError("flashcards.json must contain a list of questions")
+    return data
+
+
+def _normalize_card(idx: int, raw: Dict[str, Any], skipped: Optional[List[str]] = None) -> Optional[Card]:
+    """
+    Build a Card from one raw JSON entry, or return None if it is unusable.
+
+    Why an entry was skipped is appended to skipped, or printed without it.
+    """
+    question = raw.get("question", "").strip()
+    choices = raw.get("choices") or []
+    correct_letter = (raw.get("correct_letter") or "").lower() or None
+    source_file = raw.get("source_file")
+
+    if not question or not choices:
+        _report_skip(f"Skipping malformed card #{idx} (missing question or choices)", skipped)
+        return None
+
+    norm_choices = []
+    valid_mask = 0
+    for letter, text in _valid_choices(choices):
+        norm_choices.append(Choice(letter, text))
+        valid_mask |= 1 << (ord(letter) - 97)
+
+    if not norm_choices:
+        _report_skip(f"Skipping card #{idx} (no valid choices)", skipped)
+        return None
+
+    # Map correct letter to index if possible
+    letter_to_index = {c.letter: i for i, c in enumerate(norm_choices)}
+    correct_index = letter_to_index.get(correct_letter) if correct_letter else None
+    correct_text = norm_choices[correct_index].text if correct_index is not None else None
+
+    rendered = question + "\n\n" + "\n".join(f"  {c.letter}) {c.text}" for c in norm_choices)
+
+    return Card(
+        id=raw.get("id"),
+        source_file=intern(source_file) if source_file else source_file,
+        question=question,
+        choices=tuple(norm_choices),
+        correct_letter=correct_letter,
+        correct_index=correct_index,
+        correct_text=correct_text,
+        valid_mask=valid_mask,
+        rendered=rendered,
+    )
+
+
+def _report_skip(message: str, skipped: Optional[List[str]]) -> None:
+    """Collect a skip message into skipped, or print it if there is no list."""
+    if skipped is None:
+        print(message)
+    else:
+        skipped.append(message)
+
+
+def _skip_message(idx: int, raw: Dict[str, Any]) -> Optional[str]:
+    """
+    Explain why a raw JSON entry cannot become a card (None if it can).
+
+    Used by stream_cards() to count cards without building them; the checks
+    and messages mirror _normalize_card().
+    """
+    if not raw.get("question", "").strip() or not raw.get("choices"):
+        return f"Skipping malformed card #{idx} (missing question or choices)"
+    if next(_valid_choices(raw["choices"]), None) is None:
+        return f"Skipping card #{idx} (no valid choices)"
+    return None
+
+
+def _valid_choices(choices: List[Any]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield the normalized (letter, text) of each usable choice.
+
+    Answers are typed as a single letter, so only a-z choice letters are kept.
+    """
+    for ch in choices:
+        if isinstance(ch, dict):  # older files store {"letter": ..., "text": ...}
+            letter, text = ch.get("letter"), ch.get("text")
+        else:
+            letter, text = ch
+        letter = intern((letter or "").lower())
+        text = (text or "").strip()
+        if len(letter) == 1 and "a" <= letter <= "z" and text:
+            yield letter, text
+
+
+def _cache_path(json_path: Path) -> Path:
+    """
+    Per-user pickle cache file for a deck, keyed by its resolved path.
+
+    The cache is unpickled, and unpickling runs code, so it must never sit
+    next to the deck: question folders are shared, and a crafted .pkl in one
+    would run on load. Only files in the user's own cache directory are
+    trusted.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    digest = hashlib.sha256(str(json_path.resolve()).encode("utf-8")).hexdigest()
+    return Path(base) / "ece578-flashcards" / f"{digest[:32]}.pkl"
+
+
+def _json_cache_key(json_path: Path) -> Optional[Tuple[int, int]]:
+    """Identify the JSON file's current contents by (mtime in ns, size)."""
+    try:
+        st = json_path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _card_row(card: Card) -> Tuple[Any, ...]:
+    """
+    Flatten a Card into the plain tuple stored in the pickle cache.
+
+    Cards are pickled as tuples, not Card objects, so the cache does not
+    depend on the module name (__main__ when run as a script).
+    _load_cached_cards() rebuilds them from this layout.
+    """
+    return (
+        card.id,
+        card.source_file,
+        card.question,
+        tuple((ch.letter, ch.text) for ch in card.choices),
+        card.correct_letter,
+        card.correct_index,
+        card.correct_text,
+        card.valid_mask,
+        card.rendered,
+    )
+
+
+def _load_cached_cards(
+    cache_path: Path, json_key: Optional[Tuple[int, int]]
+) -> Optional[Tuple[List[Card], List[str]]]:
+    """
+    Return (cards, skip messages) if they were built from exactly this JSON file.
+    """
+    if json_key is None:
+        return None
+    try:
+        version, key, rows, skipped = pickle.loads(cache_path.read_bytes())
+        if version != CARD_CACHE_VERSION or tuple(key) != json_key:
+            return None
+        cards = [
+            Card(id_, source_file, question, tuple(Choice(*c) for c in choices), *rest)
+            for id_, source_file, question, choices, *rest in rows
+        ]
+        return cards, list(skipped)
+    except Exception:
+        return None  # missing, unreadable or incompatible cache
+
+
+def run_flashcards(cards: Iterable[Card], total: Optional[int] = None) -> None:
+    """
+    Main flashcard / quiz loop.
+
+    cards is either a list, which is shuffled here, or an already shuffled
+    iterator such as the one from stream_cards() passed together with its total.
+    """
+
+    if total is None:
+        # Randomize order of cards once per session
+        random.shuffle(cards)
+        total = len(cards)
 
-    total = len(cards)
     seen = 0
     answered = 0
     correct = 0
@@ -79,31 +300,32 @@ def run_flashcards(cards: List[Dict[str, Any]]) -> None:
 
     for i, card in enumerate(cards, start=1):
         print("=" * 70)
-        print(f"Question {i}/{total} | From file: {card["source_file"]}")  # <-- This stays sequential, but cards are random
-        print(card["question"])
-        print()
+        print(f"Question {i}/{total} | From file: {card.source_file}")  # <-- This stays sequential, but cards are random
+        sys.stdout.write(card.rendered)
+        sys.stdout.write("\n")
 
-        for ch in card["choices"]:
-            print(f"  {ch['letter']}) {ch['text']}")
+        user_input = input("\nYour answer (letter, Enter to skip, 'q' to quit): ")
 
-        user_input = input("\nYour answer (letter, Enter to skip, 'q' to quit): ").strip().lower()
+        # Reduce the answer to a lowercase letter code (0 if it isn't one).
+        # A single typed letter is the common case and needs no strip()/lower()
+        # copies: "| 0x20" folds A-Z onto a-z.
+        if len(user_input) == 1 and user_input.isascii() and user_input.isalpha():
+            code = ord(user_input) | 0x20
+        else:
+            user_input = user_input.strip().lower()
+            code = ord(user_input) if len(user_input) == 1 and "a" <= user_input <= "z" else 0
 
-        if user_input == "q":
+        if code == 113:  # "q"
             break
 
         seen += 1
 
-        correct_letter = card.get("correct_letter")
-        correct_index = card.get("correct_index")
-        correct_choice_text = None
-        if correct_index is not None:
-            correct_choice_text = card["choices"][correct_index]["text"]
-
-        valid_letters = {c["letter"] for c in card["choices"]}
+        correct_letter = card.correct_letter
+        correct_choice_text = card.correct_text
 
-        if user_input in valid_letters:
+        if code and card.valid_mask >> (code - 97) & 1:
             answered += 1
-            if correct_letter and user_input == correct_letter:
+            if correct_letter and chr(code) == correct_letter:
                 correct += 1
                 print("\n✅ Correct!")
             else:
@@ -1,11 +1,51 @@
 import json
+import mmap
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
-
-
-QUESTION_RE = re.compile(r"^(\d+)\.\s*(.*)$")
-CHOICE_RE = re.compile(r"^(\*?)([a-zA-Z])\.\s*(.*)$")
+from sys import intern
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+# A single pattern classifies a raw line as a question ("12. text"), a
+# choice ("a. text" / "*b. text") or anything else (continuation).
+# finditer() runs it over the whole file buffer in one pass: it only
+# matches at line starts, never crosses a newline and skips blank lines.
+# "^" only anchors after \n and the whitespace classes are ASCII-only, so
+# it is only used on buffers NEEDS_TEXT_SCAN_RE accepts (see below).
+LINE_RE = re.compile(
+    rb"^[ \t\r\f\v]*(?:(?P<qn>\d+)\.[ \t\r\f\v]*(?P<qt>.*)"
+    rb"|(?P<star>\*?)(?P<cl>[a-zA-Z])\.[ \t\r\f\v]*(?P<ct>.*)"
+    rb"|(?P<rest>\S.*))",
+    re.MULTILINE,
+)
+
+# The baseline text form of the classifier, for lines already produced by
+# str.splitlines() and str.strip()
+TEXT_LINE_RE = re.compile(
+    r"(?:(?P<qn>\d+)\.\s*(?P<qt>.*)"
+    r"|(?P<star>\*?)(?P<cl>[a-zA-Z])\.\s*(?P<ct>.*)"
+    r"|(?P<rest>.+))"
+)
+
+# Bytes for which scanning the raw buffer would differ from decoding it and
+# using str.splitlines()/str.strip(): non-ASCII (encoding fallback, U+0085,
+# U+00A0, U+2028...), the extra line breaks and whitespace \v \f \x1c-\x1f,
+# and a \r that is not part of \r\n.
+NEEDS_TEXT_SCAN_RE = re.compile(rb"[\x80-\xff\x0b\x0c\x1c-\x1f]|\r(?!\n)")
+
+# Interned one-letter strings indexed by byte value. A choice letter byte
+# (A-Z or a-z) maps to its lowercase string with "ord(letter) | 0x20", so
+# no decode/lower/intern calls are needed per choice.
+LETTERS = [intern(chr(code)) for code in range(128)]
+
+# Directories with fewer .txt files than this are parsed serially
+PARALLEL_MIN_FILES = 64
 
 
 def parse_question_file(path: Path) -> List[Dict[str, Any]]:
@@ -19,38 +59,86 @@ def parse_question_file(path: Path) -> List[Dict[str, Any]]:
 
     Returns a list of question dicts.
     """
+    questions = _parse_questions(path)
+    _warn_missing_answers(path, questions)
+    return questions
+
+
+def _parse_questions(path: Path) -> List[Dict[str, Any]]:
+    """
+    Parse a question file without printing anything (safe to run in workers).
+    """
+    # Map the file instead of copying it; the OS pages it in as it is scanned
+    with path.open("rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files (or ones that cannot be mapped) are simply read
+            buf = f.read()
+
     try:
-        text = path.read_text(encoding="utf-8")
+        if NEEDS_TEXT_SCAN_RE.search(buf) is None:
+            # Plain ASCII with \n or \r\n line endings: scan the bytes in place
+            return _collect_questions(_byte_rows(buf), bytes.decode, path)
+        return _collect_questions(_text_rows(buf[:]), str, path)
+    finally:
+        if isinstance(buf, mmap.mmap):
+            buf.close()
+
+
+def _byte_rows(buf: Union[bytes, mmap.mmap]) -> Iterator[Tuple[Optional[bytes], ...]]:
+    """
+    Classify the non-blank lines of the raw buffer in a single finditer pass.
+    """
+    for m in LINE_RE.finditer(buf):
+        yield m.groups()
+
+
+def _text_rows(raw: bytes) -> Iterator[Tuple[Optional[str], ...]]:
+    """
+    Decode the whole file and classify each non-blank line (the general path).
+    """
+    try:
+        text = raw.decode("utf-8")
     except UnicodeDecodeError:
-        text = path.read_text(encoding="cp1252")
-    lines = [ln.rstrip("\n") for ln in text.splitlines()]
+        text = raw.decode("cp1252")
 
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped:
+            yield TEXT_LINE_RE.match(stripped).groups()
+
+
+def _collect_questions(
+    rows: Iterable[Tuple[Any, ...]], decode: Callable[[Any], str], path: Path
+) -> List[Dict[str, Any]]:
+    """
+    Build question dicts from classified lines.
+
+    Each row holds the (qn, qt, star, cl, ct, rest) groups of a line, either
+    as raw bytes (decoded with decode) or as str (decode is str).
+    """
     questions = []
     current = None  # current question dict
     last_type = None  # "question" or "choice"
+    source_file = intern(path.name)  # shared by every question of the file
+    stem = path.stem
 
-    for line in lines:
-        stripped = line.strip()
-
-        # Skip totally blank lines
-        if not stripped:
-            continue
-
+    for qn, qt, star, cl, ct, rest in rows:
         # New question?
-        m_q = QUESTION_RE.match(stripped)
-        if m_q:
+        if qn is not None:
             # Finalize previous question
             if current is not None:
-                questions.append(current)
+                questions.append(_finalize_question(current))
 
-            q_number = m_q.group(1)
-            q_text = m_q.group(2).strip()
+            q_number = decode(qn)
+            q_text = decode(qt).strip()
 
             current = {
-                "id": f"{path.stem}_{q_number}",
-                "source_file": path.name,
-                "question": q_text,
-                "choices": [],
+                "id": f"{stem}_{q_number}",
+                "source_file": source_file,
+                "question": [q_text],  # text pieces, joined by _finalize_question
+                "choices": [],  # (letter, [text pieces]) pairs
                 "correct_letter": None,
                 "correct_index": None,
             }
@@ -58,19 +146,14 @@ def parse_question_file(path: Path) -> List[Dict[str, Any]]:
             continue
 
         # New choice (answer option)?
-        m_c = CHOICE_RE.match(stripped)
-        if m_c and current is not None:
-            star = m_c.group(1)
-            letter = m_c.group(2).lower()
-            text_part = m_c.group(3).strip()
+        if cl is not None and current is not None:
+            letter = LETTERS[ord(cl) | 0x20]
+            text_part = decode(ct).strip()
 
             choice_index = len(current["choices"])
-            current["choices"].append({
-                "letter": letter,
-                "text": text_part
-            })
+            current["choices"].append((letter, [text_part]))
 
-            if star == "*":
+            if star:
                 current["correct_letter"] = letter
                 current["correct_index"] = choice_index
 
@@ -79,23 +162,42 @@ def parse_question_file(path: Path) -> List[Dict[str, Any]]:
 
         # If it's not a question or a choice, treat it as a continuation line
         if current is not None:
+            stripped = decode(rest).strip()
+
+            # Skip totally blank lines
+            if not stripped:
+                continue
+
             if last_type == "question":
                 # Continuation of question text
-                current["question"] += " " + stripped
+                current["question"].append(stripped)
             elif last_type == "choice" and current["choices"]:
                 # Continuation of last choice text
-                current["choices"][-1]["text"] += " " + stripped
+                current["choices"][-1][1].append(stripped)
 
     # Finalize last question in file
     if current is not None:
-        questions.append(current)
+        questions.append(_finalize_question(current))
 
-    # Basic sanity check: warn if any question has no marked answer
+    return questions
+
+
+def _warn_missing_answers(path: Path, questions: List[Dict[str, Any]]) -> None:
+    """
+    Basic sanity check: warn if any question has no marked answer.
+    """
     for q in questions:
         if q["correct_index"] is None:
             print(f"WARNING: No correct answer marked in {path.name} for question id {q['id']}")
 
-    return questions
+
+def _finalize_question(question: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Join the text pieces collected for a question and its choices.
+    """
+    question["question"] = " ".join(question["question"])
+    question["choices"] = [(letter, " ".join(parts)) for letter, parts in question["choices"]]
+    return question
 
 
 def load_questions_from_directory(dir_path: Path) -> List[Dict[str, Any]]:
@@ -114,9 +216,10 @@ def load_questions_from_directory(dir_path: Path) -> List[Dict[str, Any]]:
 
     print(f"Found {len(txt_files)} .txt files. Parsing...")
 
-    for txt_file in txt_files:
+    # All output is printed here, in file order, even when workers parse
+    for txt_file, file_questions in zip(txt_files, _parse_files(txt_files)):
         print(f"  Parsing {txt_file.name}...")
-        file_questions = parse_question_file(txt_file)
+        _warn_missing_answers(txt_file, file_questions)
         print(f"    -> {len(file_questions)} questions found")
         all_questions.extend(file_questions)
 
@@ -124,12 +227,39 @@ def load_questions_from_directory(dir_path: Path) -> List[Dict[str, Any]]:
     return all_questions
 
 
+def _parse_files(txt_files: List[Path]) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield the parsed questions of each file, in file order.
+
+    Files are independent, so large directories are parsed in worker
+    processes; below PARALLEL_MIN_FILES starting the pool costs more than
+    it saves and the files are parsed in this process.
+    """
+    if len(txt_files) < PARALLEL_MIN_FILES:
+        yield from map(_parse_questions, txt_files)
+        return
+
+    with ProcessPoolExecutor() as ex:
+        yield from ex.map(_parse_questions, txt_files, chunksize=4)
+
+
 def save_questions_to_json(questions: List[Dict[str, Any]], output_path: Path) -> None:
     """
     Save all questions to a JSON file.
     """
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(questions, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        # Stream one question at a time instead of building the whole
+        # document in memory. Each object is shifted in by one indent level
+        # so the layout matches json.dump(indent=2).
+        with output_path.open("wb") as f:
+            f.write(b"[")
+            for i, q in enumerate(questions):
+                f.write(b",\n  " if i else b"\n  ")
+                f.write(orjson.dumps(q, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+            f.write(b"\n]" if questions else b"]")
+    else:
+        with output_path.open("w", encoding="utf-8") as f:
+            json.dump(questions, f, indent=2, ensure_ascii=False)
     print(f"Saved {len(questions)} questions to {output_path}")
 
 